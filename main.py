@@ -3,23 +3,23 @@
 # PySysdDeploy_Wizard_CLI_for_Automated_Customizable_Python_Daemon_Systemd_Service_Unit_Generation_and_Deployment_Provisioning_on_Ubuntu
 
 """
-PySysdDeploy: Python Systemd Service Deployment Wizard using Ray
+PySysdDeploy: Python Systemd Service Deployment Wizard
 A CLI tool for creating and managing Python daemon services as systemd units on Ubuntu
 """
 
 import os
 import sys
+import stat
+import errno
 import argparse
 import getpass
 import subprocess
+import shlex
+import shutil
 import time
-from pathlib import Path
-import ray
-import jinja2
-import json
-
-# Initialize Ray for parallelism
-ray.init(ignore_reinit_error=True)
+import tempfile
+import functools
+import copy
 
 # Templates for systemd service files
 STANDARD_PYTHON_TEMPLATE = """
@@ -64,127 +64,372 @@ Environment="{{ var }}"{% endfor %}{% endif %}
 WantedBy=multi-user.target
 """
 
-# Store available templates in a dictionary for easy access
-TEMPLATES = {
-    "standard_python": {
-        "name": "Standard Python Script",
-        "description": "Run a Python script in a virtual environment",
-        "template": STANDARD_PYTHON_TEMPLATE
-    },
-    "gunicorn": {
-        "name": "Gunicorn Web Application",
-        "description": "Run a Flask/Django app with Gunicorn",
-        "template": GUNICORN_TEMPLATE
-    }
-}
-
-@ray.remote
+class TemplateSpec:
+    """A service template offered by the wizard."""
+    # A plain slotted class rather than a dataclass keeps `dataclasses` out of the
+    # import path of list/status/--help
+    __slots__ = ("id", "name", "description", "template")
+    
+    def __init__(self, id, name, description, template):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.template = template
+
+# Available templates in menu order, plus an index by id for easy access
+TEMPLATE_ORDER = (
+    TemplateSpec(
+        id="standard_python",
+        name="Standard Python Script",
+        description="Run a Python script in a virtual environment",
+        template=STANDARD_PYTHON_TEMPLATE
+    ),
+    TemplateSpec(
+        id="gunicorn",
+        name="Gunicorn Web Application",
+        description="Run a Flask/Django app with Gunicorn",
+        template=GUNICORN_TEMPLATE
+    )
+)
+TEMPLATES = {spec.id: spec for spec in TEMPLATE_ORDER}
+
+# Compiled templates are persisted here so repeated CLI runs skip Jinja's parse step
+TEMPLATE_CACHE_DIR = os.path.expanduser("~/.cache/pysysddeploy/jinja")
+
+# Jinja is imported and configured on first render so that commands which
+# never render a template (list, status, start, stop, --help) skip its import
+_JINJA_ENV = None
+_TEMPLATE_CACHE_ENABLED = True
+
+def _make_bytecode_cache(cache_dir=TEMPLATE_CACHE_DIR):
+    """Create the on-disk template bytecode cache, or None if it is unusable."""
+    import jinja2
+    
+    class BestEffortBytecodeCache(jinja2.FileSystemBytecodeCache):
+        """Bytecode cache whose write failures only cost a recompile next run."""
+        def dump_bytecode(self, bucket):
+            # e.g. a root-owned cache directory left behind by an earlier sudo run
+            try:
+                super().dump_bytecode(bucket)
+            except OSError:
+                pass
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+    return BestEffortBytecodeCache(cache_dir)
+
+def _get_jinja_env():
+    """Return the shared Jinja environment, creating it on first use."""
+    global _JINJA_ENV
+    if _JINJA_ENV is None:
+        import jinja2
+        
+        # Whitespace options are left at their defaults so the rendered unit files
+        # are byte-for-byte identical to what jinja2.Template() produced.
+        _JINJA_ENV = jinja2.Environment(
+            loader=jinja2.DictLoader({spec.id: spec.template for spec in TEMPLATE_ORDER}),
+            auto_reload=False,
+            bytecode_cache=_make_bytecode_cache() if _TEMPLATE_CACHE_ENABLED else None
+        )
+    return _JINJA_ENV
+
+def disable_template_cache():
+    """Stop reading and writing the on-disk template bytecode cache."""
+    global _TEMPLATE_CACHE_ENABLED
+    _TEMPLATE_CACHE_ENABLED = False
+    if _JINJA_ENV is not None:
+        _JINJA_ENV.bytecode_cache = None
+
+def get_compiled_template(template_name):
+    """Return the compiled template for template_name, compiling it on first use."""
+    # The environment memoizes templates; with auto_reload off they are never re-checked
+    return _get_jinja_env().get_template(template_name)
+
 def validate_python_script(script_path):
     """Validate if the Python script exists."""
-    path = Path(script_path)
-    if not path.exists():
+    # A single stat() answers both "exists" and "is a regular file"
+    try:
+        st = os.stat(script_path)
+    except OSError:
         return False, f"Script {script_path} does not exist"
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return False, f"{script_path} is not a file"
     return True, "Script is valid"
 
-@ray.remote
 def validate_venv(venv_path):
     """Validate if the virtual environment exists."""
-    activate_script = os.path.join(venv_path, "bin", "activate")
-    if not os.path.exists(activate_script):
+    try:
+        os.stat(os.path.join(venv_path, "bin", "activate"))
+    except OSError:
         return False, f"Virtual environment not found at {venv_path}"
     return True, "Virtual environment is valid"
 
-@ray.remote
-def create_service_file(service_name, template_name, context, output_dir):
+# errnos from O_TMPFILE/linkat that mean "not supported here" rather than a real I/O failure
+_TMPFILE_UNSUPPORTED = (errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL)
+
+def _publish_via_tmpfile(path, data, mode):
+    """Write data to an anonymous O_TMPFILE inode and link it in as path once synced."""
+    name = os.path.basename(path)
+    tmp_name = f".{name}.{os.getpid()}.tmp"
+    dir_fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        fd = os.open(".", os.O_TMPFILE | os.O_WRONLY, mode, dir_fd=dir_fd)
+        try:
+            os.fchmod(fd, mode)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+            try:
+                os.unlink(tmp_name, dir_fd=dir_fd)
+            except FileNotFoundError:
+                pass
+            # Passing dst_dir_fd makes os.link use linkat(), and follow_symlinks adds
+            # AT_SYMLINK_FOLLOW so the /proc magic link resolves to the open inode
+            try:
+                os.link(f"/proc/self/fd/{fd}", tmp_name, dst_dir_fd=dir_fd, follow_symlinks=True)
+            except FileNotFoundError as e:
+                # No /proc (e.g. some sandboxes), so the anonymous inode cannot be named
+                raise OSError(errno.EOPNOTSUPP, "/proc/self/fd is unavailable") from e
+        finally:
+            os.close(fd)
+        try:
+            os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except BaseException:
+            os.unlink(tmp_name, dir_fd=dir_fd)
+            raise
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+def _write_file_atomically(path, content, mode=0o644):
+    """Write content to path so readers only ever see the old or the complete new file."""
+    data = content.encode()
+    
+    # On Linux the file only gets a name once it is complete, so no half-written
+    # temp file is ever visible
+    if hasattr(os, "O_TMPFILE"):
+        try:
+            _publish_via_tmpfile(path, data, mode)
+            return
+        except OSError as e:
+            if e.errno not in _TMPFILE_UNSUPPORTED:
+                raise
+            # Filesystem without O_TMPFILE support, use a named temp file instead
+    
+    with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(path) or ".", delete=False) as f:
+        try:
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    try:
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+def render_service_file(template_name, context):
+    """Render the service file contents for a template."""
+    return get_compiled_template(template_name).render(**context)
+
+def create_service_file(service_name, template_name, context, output_dir, service_content=None):
     """Create a systemd service file from template."""
     try:
         if template_name not in TEMPLATES:
             return False, f"Unknown template: {template_name}"
             
-        template = jinja2.Template(TEMPLATES[template_name]["template"])
-        service_content = template.render(**context)
+        if service_content is None:
+            service_content = render_service_file(template_name, context)
         
         # Make sure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
         service_path = os.path.join(output_dir, f"{service_name}.service")
-        with open(service_path, 'w') as f:
-            f.write(service_content)
-        return True, service_path
+        _write_file_atomically(service_path, service_content)
+        return True, {'path': service_path, 'content': service_content}
     except Exception as e:
         return False, str(e)
 
-@ray.remote
+def _run_privileged(*commands, check=False):
+    """Run commands as a single `sudo sh -c` chain that stops at the first failure."""
+    script = " && ".join(" ".join(shlex.quote(arg) for arg in cmd) for cmd in commands)
+    return subprocess.run(['sudo', 'sh', '-c', script], check=check,
+                          capture_output=True, text=True)
+
+def _spawn_and_wait(argv):
+    """Run a command that needs no captured output, raising CalledProcessError on failure."""
+    # posix_spawn skips subprocess's pipe and fd bookkeeping for fire-and-wait commands
+    if not hasattr(os, "posix_spawnp"):
+        subprocess.run(argv, check=True)
+        return
+    
+    pid = os.posix_spawnp(argv[0], argv, os.environ)
+    _, status = os.waitpid(pid, 0)
+    returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, argv)
+
+def _deploy_commands(service_name, service_path):
+    """Commands that install the unit file and make systemd pick it up."""
+    return [
+        ['cp', service_path, f'/etc/systemd/system/{service_name}.service'],
+        ['systemctl', 'daemon-reload']
+    ]
+
+def _enable_commands(service_name):
+    """Commands that enable and start the unit, then report its active state."""
+    return [
+        ['systemctl', 'enable', service_name],
+        ['systemctl', 'start', service_name],
+        ['systemctl', 'is-active', service_name]
+    ]
+
+def _activation_result(service_name, result):
+    """Interpret the output of a command chain ending in `systemctl is-active`."""
+    # Only is-active writes to stdout, so an empty stdout means an earlier step failed
+    state = result.stdout.strip()
+    if not state:
+        return False, f"Failed to deploy/start service: {result.stderr.strip()}"
+    return _activation_state_result(service_name, state)
+
+def _load_pystemd():
+    """Return pystemd's Manager and Unit classes if we can drive systemd over D-Bus directly."""
+    # Talking to systemd in-process skips sudo and systemctl entirely, but the
+    # privileged calls only succeed when we are already root
+    if os.geteuid() != 0:
+        return None
+    try:
+        from pystemd.systemd1 import Manager, Unit
+    except ImportError:
+        return None
+    return Manager, Unit
+
+def _wait_for_active_state(unit, timeout=5.0):
+    """Poll a unit until its start job has settled and return its ActiveState."""
+    deadline = time.monotonic() + timeout
+    state = unit.Unit.ActiveState.decode()
+    while state in ('inactive', 'activating', 'reloading') and time.monotonic() < deadline:
+        time.sleep(0.1)
+        state = unit.Unit.ActiveState.decode()
+    return state
+
+def _systemd_over_dbus(service_name, service_path, start=True):
+    """Deploy and optionally enable and start the service over one D-Bus connection."""
+    Manager, Unit = _load_pystemd()
+    unit_name = f"{service_name}.service".encode()
+    
+    shutil.copyfile(service_path, f'/etc/systemd/system/{service_name}.service')
+    
+    with Manager() as manager:
+        manager.Manager.Reload()
+        if not start:
+            return None
+        manager.Manager.EnableUnitFiles([unit_name], False, True)
+        # systemctl enable reloads after changing the symlinks; do the same so the
+        # running manager sees the new WantedBy= link
+        manager.Manager.Reload()
+        manager.Manager.StartUnit(unit_name, b'replace')
+    
+    with Unit(unit_name) as unit:
+        return _wait_for_active_state(unit)
+
+def _activation_state_result(service_name, state):
+    """Turn a unit's ActiveState into the (success, message) pair callers expect."""
+    if state == "active":
+        return True, f"Service {service_name} is now active and enabled at boot"
+    return False, f"Service {service_name} is not active, check logs with: sudo journalctl -u {service_name}"
+
 def deploy_service(service_name, service_path):
     """Deploy the service to systemd."""
+    if _load_pystemd() is not None:
+        try:
+            _systemd_over_dbus(service_name, service_path, start=False)
+            return True, f"Service {service_name} deployed successfully"
+        except Exception as e:
+            return False, f"Failed to deploy service: {str(e)}"
+    
     try:
-        # Copy to systemd directory
-        subprocess.run(['sudo', 'cp', service_path, f'/etc/systemd/system/{service_name}.service'], 
-                      check=True)
-        
-        # Reload systemd to recognize new service
-        subprocess.run(['sudo', 'systemctl', 'daemon-reload'], check=True)
-        
+        _run_privileged(*_deploy_commands(service_name, service_path), check=True)
         return True, f"Service {service_name} deployed successfully"
     except subprocess.CalledProcessError as e:
-        return False, f"Failed to deploy service: {str(e)}"
+        return False, f"Failed to deploy service: {e.stderr.strip() or str(e)}"
 
-@ray.remote
-def enable_service(service_name):
-    """Enable and start the systemd service."""
-    try:
-        # Enable service
-        subprocess.run(['sudo', 'systemctl', 'enable', service_name], check=True)
-        
-        # Start service
-        subprocess.run(['sudo', 'systemctl', 'start', service_name], check=True)
-        
-        # Check status
-        result = subprocess.run(['systemctl', 'is-active', service_name], 
-                                capture_output=True, text=True)
-        if result.stdout.strip() == "active":
-            return True, f"Service {service_name} is now active and enabled at boot"
-        else:
-            return False, f"Service {service_name} is not active, check logs with: sudo journalctl -u {service_name}"
-    except subprocess.CalledProcessError as e:
-        return False, f"Failed to enable/start service: {str(e)}"
+def deploy_and_enable_service(service_name, service_path):
+    """Deploy, enable and start the service with a single sudo or D-Bus session."""
+    if _load_pystemd() is not None:
+        try:
+            return _activation_state_result(service_name, _systemd_over_dbus(service_name, service_path))
+        except Exception as e:
+            return False, f"Failed to deploy/start service: {str(e)}"
+    
+    result = _run_privileged(*_deploy_commands(service_name, service_path),
+                             *_enable_commands(service_name))
+    return _activation_result(service_name, result)
 
-@ray.remote
-def check_service_status(service_name):
-    """Check the status of the deployed service."""
-    try:
-        result = subprocess.run(['systemctl', 'status', service_name], 
-                               capture_output=True, text=True)
-        return True, result.stdout
-    except subprocess.CalledProcessError:
-        return False, f"Failed to get status for {service_name}"
+def show_service_status(service_name):
+    """Print the status of the service straight to the terminal and return systemctl's exit code."""
+    # --no-pager keeps the old print-everything behaviour now that stdout may be a TTY
+    return subprocess.run(['systemctl', 'status', '--no-pager', service_name]).returncode
+
+def get_service_state(service_name):
+    """Get the service's key state properties without the journal tail `status` adds."""
+    result = subprocess.run(['systemctl', 'show', '-p', 'ActiveState,SubState,MainPID,ExecMainStartTimestamp',
+                             service_name], capture_output=True, text=True)
+    state = {}
+    for line in result.stdout.splitlines():
+        key, sep, value = line.partition('=')
+        if sep:
+            state[key] = value
+    return result.returncode == 0, state
 
 def parse_env_vars(env_string):
     """Parse environment variables from string to list."""
     if not env_string:
         return []
     
-    # Split by spaces, but respect quoted values
-    parts = []
-    current = ""
-    in_quotes = False
-    for char in env_string:
-        if char == '"':
-            in_quotes = not in_quotes
-            current += char
-        elif char == ' ' and not in_quotes:
-            if current:
-                parts.append(current)
-                current = ""
-        else:
-            current += char
-    
-    if current:
-        parts.append(current)
-        
-    return parts
+    # Split by spaces, but let double quotes group a value; apostrophes and
+    # backslashes are ordinary characters
+    try:
+        return _split_env_vars(env_string)
+    except ValueError:
+        # Unterminated double quote, let it run to the end of the string
+        return _split_env_vars(env_string + '"')
+
+def _split_env_vars(env_string):
+    """Split on whitespace with double quotes as the only grouping characters."""
+    lex = shlex.shlex(env_string, posix=True)
+    lex.whitespace_split = True
+    lex.quotes = '"'
+    lex.escape = ''
+    return list(lex)
+
+def format_env_vars(env_vars):
+    """Format a list of environment variables so parse_env_vars reads it back unchanged."""
+    return ' '.join(f'"{var}"' if any(c.isspace() for c in var) else var for var in env_vars)
+
+@functools.lru_cache(maxsize=None)
+def _prompt_session():
+    """Return a shared prompt_toolkit session, or None to fall back to input()."""
+    if not sys.stdin.isatty():
+        return None
+    try:
+        from prompt_toolkit import PromptSession
+    except ImportError:
+        return None
+    return PromptSession()
+
+def _ask(message):
+    """Prompt for a line of input, reusing one prompt session across the wizard."""
+    session = _prompt_session()
+    if session is None:
+        return input(message)
+    return session.prompt(message)
 
 def gather_service_info():
     """Interactive wizard to gather service information from user."""
@@ -193,55 +438,55 @@ def gather_service_info():
     service_info = {}
     
     # Get service basics
-    service_info['name'] = input("Service name: ").strip()
-    service_info['description'] = input("Service description: ").strip()
+    service_info['name'] = _ask("Service name: ").strip()
+    service_info['description'] = _ask("Service description: ").strip()
     
     # Choose template
     print("\nAvailable templates:")
-    for i, (template_id, template_data) in enumerate(TEMPLATES.items(), 1):
-        print(f"{i}) {template_data['name']} - {template_data['description']}")
+    for i, spec in enumerate(TEMPLATE_ORDER, 1):
+        print(f"{i}) {spec.name} - {spec.description}")
     
-    template_choice = input(f"Select template [1-{len(TEMPLATES)}]: ").strip()
+    template_choice = _ask(f"Select template [1-{len(TEMPLATE_ORDER)}]: ").strip()
     template_idx = 0  # Default to first template
     if template_choice and template_choice.isdigit():
-        template_idx = int(template_choice) - 1 if 0 <= int(template_choice) - 1 < len(TEMPLATES) else 0
+        template_idx = int(template_choice) - 1 if 0 <= int(template_choice) - 1 < len(TEMPLATE_ORDER) else 0
     
-    template_id = list(TEMPLATES.keys())[template_idx]
+    template_id = TEMPLATE_ORDER[template_idx].id
     service_info['template'] = template_id
     
     # Get working directory
     default_dir = os.getcwd()
-    working_dir = input(f"Working directory [default: {default_dir}]: ").strip()
+    working_dir = _ask(f"Working directory [default: {default_dir}]: ").strip()
     service_info['working_directory'] = working_dir if working_dir else default_dir
     
     # Get virtual environment path
-    venv_path = input("Path to virtual environment (e.g., /path/to/venv): ").strip()
+    venv_path = _ask("Path to virtual environment (e.g., /path/to/venv): ").strip()
     service_info['venv_path'] = os.path.abspath(os.path.expanduser(venv_path))
     
     # Template-specific information
     if template_id == "standard_python":
         # Get script details
-        script_path = input("Full path to Python script: ").strip()
+        script_path = _ask("Full path to Python script: ").strip()
         service_info['script_path'] = os.path.abspath(os.path.expanduser(script_path))
         
         # Get script arguments
-        service_info['script_args'] = input("Script arguments (if any): ").strip()
+        service_info['script_args'] = _ask("Script arguments (if any): ").strip()
         
     elif template_id == "gunicorn":
         # Get gunicorn specifics
-        bind_address = input("Bind address (e.g., 0.0.0.0:8000): ").strip() or "0.0.0.0:8000"
+        bind_address = _ask("Bind address (e.g., 0.0.0.0:8000): ").strip() or "0.0.0.0:8000"
         service_info['bind_address'] = bind_address
         
-        app_module = input("App module (e.g., app:app for Flask or wsgi:application for Django): ").strip()
+        app_module = _ask("App module (e.g., app:app for Flask or wsgi:application for Django): ").strip()
         service_info['app_module'] = app_module
     
     # Get user/group
     default_user = getpass.getuser()
-    user = input(f"User to run the service [default: {default_user}]: ").strip()
+    user = _ask(f"User to run the service [default: {default_user}]: ").strip()
     service_info['user'] = user if user else default_user
     
     default_group = default_user
-    group = input(f"Group to run the service [default: {default_group}]: ").strip()
+    group = _ask(f"Group to run the service [default: {default_group}]: ").strip()
     service_info['group'] = group if group else default_group
     
     # Restart policy
@@ -250,19 +495,19 @@ def gather_service_info():
     for i, policy in enumerate(restart_options):
         print(f"{i}) {policy}")
     
-    restart_choice = input("Select restart policy [default: 1 (always)]: ").strip()
+    restart_choice = _ask("Select restart policy [default: 1 (always)]: ").strip()
     restart_idx = 1  # Default to 'always'
     if restart_choice and restart_choice.isdigit():
         restart_idx = int(restart_choice) if 0 <= int(restart_choice) < len(restart_options) else 1
     service_info['restart_policy'] = restart_options[restart_idx]
     
     # Restart seconds
-    service_info['restart_sec'] = input("Restart delay in seconds [default: 3]: ").strip() or "3"
+    service_info['restart_sec'] = _ask("Restart delay in seconds [default: 3]: ").strip() or "3"
     
     # Environment variables
     print("\nAdditional environment variables (beyond PATH and PYTHONUNBUFFERED)")
     print("Format: KEY1=VALUE1 KEY2=VALUE2 (space-separated)")
-    env_vars = input("Environment variables: ").strip()
+    env_vars = _ask("Environment variables: ").strip()
     service_info['additional_env_vars'] = parse_env_vars(env_vars)
     
     # Review and confirm
@@ -270,25 +515,48 @@ def gather_service_info():
     for key, value in service_info.items():
         print(f"{key}: {value}")
     
-    confirm = input("\nDoes this look correct? [Y/n]: ").strip().lower()
+    confirm = _ask("\nDoes this look correct? [Y/n]: ").strip().lower()
     if confirm == 'n':
         print("Configuration cancelled. Please run the wizard again.")
         sys.exit(0)
         
     return service_info
 
+@functools.lru_cache(maxsize=None)
+def _json_codec():
+    """Return (dumps, loads) functions working on bytes, using orjson when installed."""
+    try:
+        import orjson
+    except ImportError:
+        import json
+        return (lambda obj: json.dumps(obj, indent=2).encode()), json.loads
+    return (lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)), orjson.loads
+
 def save_service_config(service_info, path=None):
     """Save service configuration to a JSON file for later use."""
+    dumps, _ = _json_codec()
+    
     if path is None:
         config_dir = os.path.expanduser("~/.config/pysysddeploy")
         os.makedirs(config_dir, exist_ok=True)
         path = os.path.join(config_dir, f"{service_info['name']}.json")
     
-    with open(path, 'w') as f:
-        json.dump(service_info, f, indent=2)
+    with open(path, 'wb') as f:
+        f.write(dumps(service_info))
+    
+    # Drop any cached copy of the file we just rewrote
+    _read_service_config.cache_clear()
     
     return path
 
+@functools.lru_cache(maxsize=32)
+def _read_service_config(path):
+    """Read and parse a configuration file, cached by absolute path."""
+    _, loads = _json_codec()
+    
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
 def load_service_config(name=None, path=None):
     """Load service configuration from a JSON file."""
     if path is None and name is not None:
@@ -297,17 +565,17 @@ def load_service_config(name=None, path=None):
     if not os.path.exists(path):
         return None
     
-    with open(path, 'r') as f:
-        return json.load(f)
+    # Hand out a copy so callers can edit it without touching the cache
+    return copy.deepcopy(_read_service_config(os.path.abspath(path)))
 
-def preview_service_file(template_name, context):
+def preview_service_file(template_name, context, service_content=None):
     """Generate and show a preview of the service file."""
     if template_name not in TEMPLATES:
         print(f"Unknown template: {template_name}")
         return
         
-    template = jinja2.Template(TEMPLATES[template_name]["template"])
-    service_content = template.render(**context)
+    if service_content is None:
+        service_content = render_service_file(template_name, context)
     
     print("\n=== Service File Preview ===")
     print(service_content)
@@ -323,7 +591,7 @@ def edit_service_info(service_info):
             print(f"{i}) {field}: {service_info[field]}")
         print(f"{len(fields)+1}) Done editing")
         
-        choice = input(f"Select field to edit [1-{len(fields)+1}]: ").strip()
+        choice = _ask(f"Select field to edit [1-{len(fields)+1}]: ").strip()
         if not choice.isdigit():
             continue
             
@@ -335,11 +603,11 @@ def edit_service_info(service_info):
             current = service_info[field]
             
             if isinstance(current, list):
-                print(f"Current value: {' '.join(current)}")
-                new_value = input(f"Enter new value for {field} (space-separated list): ").strip()
+                print(f"Current value: {format_env_vars(current)}")
+                new_value = _ask(f"Enter new value for {field} (space-separated list): ").strip()
                 service_info[field] = parse_env_vars(new_value)
             else:
-                new_value = input(f"Enter new value for {field} [current: {current}]: ").strip()
+                new_value = _ask(f"Enter new value for {field} [current: {current}]: ").strip()
                 if new_value:
                     service_info[field] = new_value
         else:
@@ -347,8 +615,146 @@ def edit_service_info(service_info):
             
     return service_info
 
+def _run_create(args):
+    """Gather, render, save and optionally deploy a service for the create command."""
+    if args.no_template_cache:
+        disable_template_cache()
+    
+    # Load or gather service info
+    service_info = None
+    
+    if args.load:
+        service_info = load_service_config(path=args.load)
+        if service_info is None:
+            print(f"Error: Could not load configuration from {args.load}")
+            return 1
+        print(f"Loaded service configuration from {args.load}")
+    
+    elif args.interactive or not (args.name and args.template and args.venv_path):
+        # Interactive mode
+        service_info = gather_service_info()
+    else:
+        # Command line mode
+        template = args.template
+        
+        if template == "standard_python" and not args.script_path:
+            print("Error: --script-path is required for standard_python template")
+            return 1
+        elif template == "gunicorn" and not args.app_module:
+            print("Error: --app-module is required for gunicorn template")
+            return 1
+        
+        service_info = {
+            'name': args.name,
+            'description': args.description or f"Python service {args.name}",
+            'template': template,
+            'working_directory': os.path.abspath(os.path.expanduser(args.working_dir)) if args.working_dir else os.getcwd(),
+            'venv_path': os.path.abspath(os.path.expanduser(args.venv_path)),
+            'user': args.user or getpass.getuser(),
+            'group': args.group or getpass.user or getpass.getuser(),
+            'restart_policy': args.restart,
+            'restart_sec': args.restart_sec,
+            'additional_env_vars': parse_env_vars(args.env or "")
+        }
+        
+        # Template-specific fields
+        if template == "standard_python":
+            service_info['script_path'] = os.path.abspath(os.path.expanduser(args.script_path))
+            service_info['script_args'] = args.script_args or ""
+        elif template == "gunicorn":
+            service_info['bind_address'] = args.bind_address or "0.0.0.0:8000"
+            service_info['app_module'] = args.app_module
+    
+    # Allow editing configuration if requested
+    if args.edit and service_info:
+        service_info = edit_service_info(service_info)
+    
+    # Validate inputs, running every check before prompting about failures
+    print(f"\nValidating virtual environment at {service_info['venv_path']}...")
+    validations = [("Virtual environment", validate_venv(service_info['venv_path']))]
+    
+    if service_info['template'] == "standard_python":
+        print(f"Validating script at {service_info['script_path']}...")
+        validations.append(("Script", validate_python_script(service_info['script_path'])))
+    
+    for label, (is_valid, message) in validations:
+        if not is_valid:
+            print(f"Warning: {message}")
+            proceed = input(f"{label} validation failed. Proceed anyway? [y/N]: ").strip().lower()
+            if proceed != 'y':
+                return 1
+    
+    # Render once and reuse the result for the preview, the file and its echo
+    service_content = None
+    if service_info['template'] in TEMPLATES:
+        try:
+            service_content = render_service_file(service_info['template'], service_info)
+        except Exception as e:
+            print(f"Error creating service file: {e}")
+            return 1
+    
+    # Preview service file if requested
+    if args.preview:
+        preview_service_file(service_info['template'], service_info, service_content)
+        
+        # Ask if user wants to proceed
+        proceed = input("\nProceed with creation? [Y/n]: ").strip().lower()
+        if proceed == 'n':
+            return 0
+    
+    # Save configuration
+    config_path = save_service_config(service_info)
+    print(f"Configuration saved to: {config_path}")
+    
+    # Create service file
+    output_dir = args.output or os.path.expanduser("~/systemd-services")
+    print("Creating service file...")
+    success, result = create_service_file(
+        service_info['name'], 
+        service_info['template'],
+        service_info,
+        output_dir,
+        service_content
+    )
+    
+    if not success:
+        print(f"Error creating service file: {result}")
+        return 1
+    
+    service_path = result['path']
+    print(f"Service file created at: {service_path}")
+    
+    # Preview final service file from memory rather than reading it back
+    print("\n=== Service File ===")
+    print(result['content'])
+    print("===================")
+    
+    # Deploy if requested
+    deploy = input("Deploy service now? [y/N]: ").strip().lower()
+    if deploy != 'y':
+        return 0
+    
+    # Ask up front so deploy, enable and start can share one sudo call
+    start = input("Start and enable service? [Y/n]: ").strip().lower()
+    print("Deploying service...")
+    if start == 'n':
+        success, message = deploy_service(service_info['name'], service_path)
+        print(message)
+    else:
+        success, message = deploy_and_enable_service(service_info['name'], service_path)
+        print(message)
+        
+        if success:
+            time.sleep(2)  # Give service time to start
+            _, state = get_service_state(service_info['name'])
+            print("\nService Status:")
+            for key, value in state.items():
+                print(f"{key}: {value}")
+    
+    return 0 if success else 1
+
 def main():
-    parser = argparse.ArgumentParser(description="Deploy Python scripts as systemd services using Ray")
+    parser = argparse.ArgumentParser(description="Deploy Python scripts as systemd services")
     
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
@@ -373,6 +779,7 @@ def main():
     create_parser.add_argument("--preview", action="store_true", help="Preview service file without deploying")
     create_parser.add_argument("--edit", action="store_true", help="Edit configuration interactively")
     create_parser.add_argument("--output", help="Output directory for service files")
+    create_parser.add_argument("--no-template-cache", action="store_true", help="Do not use the on-disk template cache")
     
     # List command
     list_parser = subparsers.add_parser("list", help="List available saved service configurations")
@@ -391,151 +798,36 @@ def main():
     
     args = parser.parse_args()
     
-    if args.command == "create":
-        # Load or gather service info
-        service_info = None
-        
-        if args.load:
-            service_info = load_service_config(path=args.load)
-            if service_info is None:
-                print(f"Error: Could not load configuration from {args.load}")
-                return 1
-            print(f"Loaded service configuration from {args.load}")
-        
-        elif args.interactive or not (args.name and args.template and args.venv_path):
-            # Interactive mode
-            service_info = gather_service_info()
-        else:
-            # Command line mode
-            template = args.template
-            
-            if template == "standard_python" and not args.script_path:
-                print("Error: --script-path is required for standard_python template")
-                return 1
-            elif template == "gunicorn" and not args.app_module:
-                print("Error: --app-module is required for gunicorn template")
-                return 1
-            
-            service_info = {
-                'name': args.name,
-                'description': args.description or f"Python service {args.name}",
-                'template': template,
-                'working_directory': os.path.abspath(os.path.expanduser(args.working_dir)) if args.working_dir else os.getcwd(),
-                'venv_path': os.path.abspath(os.path.expanduser(args.venv_path)),
-                'user': args.user or getpass.getuser(),
-                'group': args.group or getpass.user or getpass.getuser(),
-                'restart_policy': args.restart,
-                'restart_sec': args.restart_sec,
-                'additional_env_vars': parse_env_vars(args.env or "")
-            }
-            
-            # Template-specific fields
-            if template == "standard_python":
-                service_info['script_path'] = os.path.abspath(os.path.expanduser(args.script_path))
-                service_info['script_args'] = args.script_args or ""
-            elif template == "gunicorn":
-                service_info['bind_address'] = args.bind_address or "0.0.0.0:8000"
-                service_info['app_module'] = args.app_module
-        
-        # Allow editing configuration if requested
-        if args.edit and service_info:
-            service_info = edit_service_info(service_info)
-        
-        # Validate inputs
-        print(f"\nValidating virtual environment at {service_info['venv_path']}...")
-        is_valid, message = ray.get(validate_venv.remote(service_info['venv_path']))
-        if not is_valid:
-            print(f"Warning: {message}")
-            proceed = input("Virtual environment validation failed. Proceed anyway? [y/N]: ").strip().lower()
-            if proceed != 'y':
-                return 1
-        
-        if service_info['template'] == "standard_python":
-            print(f"Validating script at {service_info['script_path']}...")
-            is_valid, message = ray.get(validate_python_script.remote(service_info['script_path']))
-            if not is_valid:
-                print(f"Warning: {message}")
-                proceed = input("Script validation failed. Proceed anyway? [y/N]: ").strip().lower()
-                if proceed != 'y':
-                    return 1
-        
-        # Preview service file if requested
-        if args.preview:
-            preview_service_file(service_info['template'], service_info)
-            
-            # Ask if user wants to proceed
-            proceed = input("\nProceed with creation? [Y/n]: ").strip().lower()
-            if proceed == 'n':
-                return 0
-        
-        # Save configuration
-        config_path = save_service_config(service_info)
-        print(f"Configuration saved to: {config_path}")
-        
-        # Create service file
-        output_dir = args.output or os.path.expanduser("~/systemd-services")
-        print("Creating service file...")
-        success, result = ray.get(create_service_file.remote(
-            service_info['name'], 
-            service_info['template'],
-            service_info,
-            output_dir
-        ))
-        
-        if not success:
-            print(f"Error creating service file: {result}")
-            return 1
-        
-        print(f"Service file created at: {result}")
-        
-        # Preview final service file
-        with open(result, 'r') as f:
-            print("\n=== Service File ===")
-            print(f.read())
-            print("===================")
-        
-        # Deploy if requested
-        deploy = input("Deploy service now? [y/N]: ").strip().lower()
-        if deploy == 'y':
-            print("Deploying service...")
-            success, message = ray.get(deploy_service.remote(service_info['name'], result))
-            print(message)
-            
-            if success:
-                start = input("Start and enable service? [Y/n]: ").strip().lower()
-                if start != 'n':
-                    success, message = ray.get(enable_service.remote(service_info['name']))
-                    print(message)
-                    
-                    if success:
-                        time.sleep(2)  # Give service time to start
-                        _, status = ray.get(check_service_status.remote(service_info['name']))
-                        print("\nService Status:")
-                        print(status)
-    
-    elif args.command == "list":
+    # Management commands only need the standard library and a systemctl call and
+    # return straight away; only create reaches the template machinery
+    if args.command == "list":
         config_dir = os.path.expanduser("~/.config/pysysddeploy")
         if not os.path.exists(config_dir):
             print("No saved service configurations found.")
             return 0
             
-        configs = [f for f in os.listdir(config_dir) if f.endswith('.json')]
+        with os.scandir(config_dir) as it:
+            entries = [(os.path.splitext(e.name)[0], e.path) for e in it if e.name.endswith('.json')]
+        
+        # Read each configuration once and reuse it for the detail view, skipping
+        # files removed since the directory scan
+        configs = []
+        for service_name, config_path in entries:
+            config = load_service_config(path=config_path)
+            if config is not None:
+                configs.append((service_name, config_path, config))
         if not configs:
             print("No saved service configurations found.")
             return 0
-            
+        
         print("\nSaved service configurations:")
-        for i, config_file in enumerate(configs, 1):
-            service_name = os.path.splitext(config_file)[0]
-            config = load_service_config(name=service_name)
-            template_name = TEMPLATES[config['template']]['name'] if 'template' in config else "Unknown"
+        for i, (service_name, config_path, config) in enumerate(configs, 1):
+            template_name = TEMPLATES[config['template']].name if 'template' in config else "Unknown"
             print(f"{i}) {service_name} - {template_name}")
             
         select = input("\nEnter number to view details (or press Enter to cancel): ").strip()
         if select and select.isdigit() and 1 <= int(select) <= len(configs):
-            config_file = configs[int(select) - 1]
-            service_name = os.path.splitext(config_file)[0]
-            config = load_service_config(name=service_name)
+            service_name, config_path, config = configs[int(select) - 1]
             
             print(f"\n=== {service_name} Configuration ===")
             for key, value in config.items():
@@ -545,31 +837,36 @@ def main():
             if option == 'l':
                 # Re-run the command with --load
                 os.execl(sys.executable, sys.executable, sys.argv[0], 
-                         "create", "--load", os.path.join(config_dir, config_file))
+                         "create", "--load", config_path)
             elif option == 'p':
                 preview_service_file(config['template'], config)
+        return 0
         
     elif args.command == "status":
-        _, status = ray.get(check_service_status.remote(args.name))
-        print(status)
+        return show_service_status(args.name)
         
     elif args.command == "stop":
         try:
-            subprocess.run(['sudo', 'systemctl', 'stop', args.name], check=True)
+            _spawn_and_wait(['sudo', 'systemctl', 'stop', args.name])
             print(f"Service {args.name} stopped")
+            return 0
         except subprocess.CalledProcessError as e:
             print(f"Failed to stop service: {e}")
+            return 1
             
     elif args.command == "start":
         try:
-            subprocess.run(['sudo', 'systemctl', 'start', args.name], check=True)
+            _spawn_and_wait(['sudo', 'systemctl', 'start', args.name])
             time.sleep(1)  # Give service time to start
-            _, status = ray.get(check_service_status.remote(args.name))
-            print(status)
+            return show_service_status(args.name)
         except subprocess.CalledProcessError as e:
             print(f"Failed to start service: {e}")
+            return 1
+    elif args.command == "create":
+        return _run_create(args)
     else:
         parser.print_help()
+        return 0
 
 if __name__ == "__main__":
     sys.exit(main())